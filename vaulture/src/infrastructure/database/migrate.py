@@ -11,9 +11,13 @@ Design philosophy
   The prefix becomes the *target* value of SQLite's `PRAGMA user_version`.
 * **Idempotent execution**: already-applied migrations are skipped by
   comparing their prefix with the current `user_version`.
-* **Transactional safety**: each file is wrapped in a single
-  `executescript` call inside a context manager (`with conn:`) so it
-  commits atomically or rolls back on error.
+* **Transactional safety**: every pending file is concatenated into a
+  single `executescript` call wrapped in an explicit ``BEGIN``/``COMMIT``
+  inside a context manager (`with conn:`), so the whole batch – including
+  the `user_version` bump – commits atomically (one fsync) or rolls back
+  on error.  Migration files must therefore not manage transactions
+  themselves, nor use statements that only work *outside* one (see
+  :func:`_apply_migrations`).
 * **Foreign-key enforcement**: immediately enable `PRAGMA foreign_keys`
   to ensure all later DDL respects constraints.
 
@@ -24,12 +28,22 @@ imported by the application bootstrapper.
 
 from __future__ import annotations
 
+import os
+import re
 import sqlite3
+from bisect import bisect_right
+from functools import lru_cache
+from operator import itemgetter
 from pathlib import Path
 from typing import List, Tuple
 
 from src.utils.paths import db_path, migrations_path
 
+#: Leading ASCII-digit version prefix of a migration filename.  Compiled
+#: once; stricter than ``int()``, which also accepts signs, surrounding
+#: whitespace and non-ASCII digits.
+_PREFIX_RE = re.compile(r"([0-9]+)_")
+
 # --------------------------------------------------------------------------- #
 # Low-level helpers
 # --------------------------------------------------------------------------- #
@@ -42,6 +56,12 @@ def _connect() -> sqlite3.Connection:
     which uses a context manager).  Foreign keys are enabled immediately
     to guarantee relational integrity for every subsequent statement.
 
+    The journal mode is deliberately left alone: ``journal_mode`` is
+    stored in the vault file itself, so switching it here would change
+    every future connection (and add ``-wal``/``-shm`` sidecars) as a side
+    effect of migrating.  That decision belongs with the application's
+    long-lived connection.
+
     Returns
     -------
     sqlite3.Connection
@@ -66,18 +86,32 @@ def _current_version(conn: sqlite3.Connection) -> int:
     return cur.fetchone()[0]
 
 
+@lru_cache(maxsize=1)
 def _list_sql_files() -> List[Path]:
     """
     Enumerate all ``*.sql`` files inside the *migrations* directory,
     sorted lexicographically so natural numeric ordering holds (because
     of zero-padded prefixes).
 
+    Migrations are read-only assets shipped with the application, so the
+    directory is scanned once per process and the result is cached.  A
+    single ``os.scandir`` pass filters on plain name strings (file type
+    comes from the directory entry, usually without a ``stat``); only the
+    matches are wrapped in :class:`~pathlib.Path`.
+
     Returns
     -------
     list[pathlib.Path]
         Absolute paths of every `.sql` migration.
     """
-    return sorted(migrations_path().glob("*.sql"))
+    base: Path = migrations_path()
+    with os.scandir(base) as entries:
+        names: List[str] = sorted(
+            entry.name
+            for entry in entries
+            if entry.name.endswith(".sql") and entry.is_file()
+        )
+    return [base / name for name in names]
 
 
 def _extract_prefix(file_path: Path) -> int:
@@ -91,10 +125,32 @@ def _extract_prefix(file_path: Path) -> int:
     Raises
     ------
     ValueError
-        If the prefix is missing or not an integer.
+        If the prefix is missing or not made of ASCII digits.
+    """
+    match = _PREFIX_RE.match(file_path.name)
+    if match is None:
+        raise ValueError(f"migration file has no numeric prefix: {file_path.name!r}")
+    return int(match.group(1))
+
+
+@lru_cache(maxsize=1)
+def _sorted_migrations() -> List[Tuple[int, Path]]:
     """
-    prefix_str: str = file_path.name.split("_", 1)[0]
-    return int(prefix_str)
+    Parse every migration prefix once and cache the result.
+
+    Call ``_sorted_migrations.cache_clear()`` after swapping out
+    :func:`_list_sql_files` to force a rebuild.
+
+    Returns
+    -------
+    list[tuple[int, pathlib.Path]]
+        ``(version, Path)`` pairs in ascending version order, ready to be
+        binary-searched on the version with :mod:`bisect`.
+    """
+    return sorted(
+        ((_extract_prefix(sql_file), sql_file) for sql_file in _list_sql_files()),
+        key=itemgetter(0),
+    )
 
 
 def _pending_migrations(current_version: int) -> List[Tuple[int, Path]]:
@@ -108,18 +164,12 @@ def _pending_migrations(current_version: int) -> List[Tuple[int, Path]]:
     Notes
     -----
     Using tuples keeps the version integer adjacent to its file path,
-    making later loops clearer and type-safe.
+    making later loops clearer and type-safe.  The cached index lets us
+    locate the first pending migration with a binary search instead of
+    re-parsing every filename.
     """
-    pending_files: List[Tuple[int, Path]] = []
-    for sql_file in _list_sql_files():
-        file_version: int = _extract_prefix(sql_file)
-        if file_version > current_version:
-            pending_files.append((file_version, sql_file))
-
-    # Explicit sort – even though _list_sql_files() is sorted, this adds
-    # a safety net if someone renames a file incorrectly.
-    pending_files.sort(key=lambda pair: pair[0])
-    return pending_files
+    migrations = _sorted_migrations()
+    return migrations[bisect_right(migrations, current_version, key=itemgetter(0)):]
 
 
 def _apply_migration(
@@ -130,22 +180,75 @@ def _apply_migration(
     """
     Execute a single SQL migration and update ``user_version``.
 
-    The context manager around *conn* in :func:`run` guarantees a commit
-    if the script succeeds or a rollback plus raised exception if it
-    fails – keeping the database in a consistent state.
+    The ``PRAGMA user_version`` bump is appended to the same script as
+    the migration itself, so both run in one ``executescript`` round-trip
+    and one transaction: a commit if the script succeeds or a rollback
+    plus raised exception if it fails – keeping the database in a
+    consistent state.
 
     Parameters
     ----------
     conn : sqlite3.Connection
-        An *open* connection with active transaction scope.
+        An *open* connection.
     sql_file : pathlib.Path
         Path to the ``*.sql`` file to be executed.
     version : int
         Target schema version after applying this migration.
     """
+    _apply_migrations(conn, [(version, sql_file)])
+
+
+def _apply_migrations(
+    conn: sqlite3.Connection,
+    pending: List[Tuple[int, Path]],
+) -> None:
+    """
+    Execute every pending migration as **one** transaction.
+
+    All SQL files are joined into a single script bracketed by
+    ``BEGIN``/``COMMIT`` with the final ``PRAGMA user_version`` inside the
+    same transaction, so *N* migrations cost one commit instead of *N*.
+    Each file is followed by ``\\n;`` so a trailing ``--`` comment or a
+    missing final semicolon cannot swallow the next statement.
+
+    If any statement fails, ``executescript`` stops with the transaction
+    still open and the ``with conn:`` block rolls it back – no migration
+    from the batch is applied and ``user_version`` is left untouched.
+
+    Because every file runs *inside* that transaction, migration files
+    must not contain:
+
+    * ``BEGIN`` / ``COMMIT`` / ``ROLLBACK`` – the runner owns the
+      transaction.
+    * ``PRAGMA foreign_keys = OFF`` – SQLite silently ignores it inside
+      a transaction, so the first step of the documented table-rebuild
+      procedure does nothing and ``DROP TABLE`` fires FK actions
+      (cascades) anyway.  Use ``PRAGMA defer_foreign_keys = ON`` plus a
+      final ``PRAGMA foreign_key_check`` instead, or rebuild without
+      dropping referenced tables.
+    * ``VACUUM`` or a ``PRAGMA journal_mode`` change – both are refused
+      inside a transaction and fail the whole batch.
+
+    Parameters
+    ----------
+    conn : sqlite3.Connection
+        An *open* connection.
+    pending : list[tuple[int, pathlib.Path]]
+        Output of :func:`_pending_migrations`; must be non-empty.
+    """
+    # Raw bytes skip the text-mode newline translation of read_text()
+    # (SQLite treats a stray "\r" as plain whitespace anyway), and the
+    # joined batch is decoded once instead of once per file.
+    script: str = b"\n;\n".join(
+        sql_file.read_bytes() for _, sql_file in pending
+    ).decode("utf-8")
+    target_version: int = pending[-1][0]
     with conn:
-        conn.executescript(sql_file.read_text(encoding="utf-8"))
-        conn.execute(f"PRAGMA user_version = {version}") 
+        conn.executescript(
+            f"BEGIN;\n{script}\n;\n"
+            f"PRAGMA user_version = {target_version};\n"
+            "COMMIT;"
+        )
 
 
 # --------------------------------------------------------------------------- #
@@ -163,15 +266,13 @@ def run() -> None:  # noqa: D401
     Raises
     ------
     sqlite3.Error
-        Propagated up if any migration fails; the transaction for that
-        file is rolled back automatically by the context manager.
+        Propagated up if any migration fails; the whole batch is rolled
+        back automatically, leaving the schema at its previous version.
     """
     with _connect() as conn:
-        current_version: int = _current_version(conn)
-
-        for version, file in _pending_migrations(current_version):
-            _apply_migration(conn, file, version)
-            current_version = version  # for clarity in future loops
+        pending = _pending_migrations(_current_version(conn))
+        if pending:
+            _apply_migrations(conn, pending)
 
 
 # --------------------------------------------------------------------------- #
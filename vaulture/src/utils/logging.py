@@ -10,6 +10,9 @@ Design goals
   formatting.
 * **Privacy by default** – redact highly-sensitive keys so plaintext
   secrets never reach disk or console.
+* **Non-blocking I/O** – callers only enqueue records; a background
+  :class:`logging.handlers.QueueListener` thread owns the file and
+  console handlers, so disk writes and rotation never stall the caller.
 * **Rotation & retention** – 1 MiB rolling logs with five backups keep
   disk usage bounded while preserving recent history for debugging.
 * **Frozen-aware** – in a packaged build the log goes to the per-user
@@ -31,9 +34,12 @@ The first call triggers configuration; subsequent calls are cheap no-ops.
 
 from __future__ import annotations
 
+import atexit
 import logging
 import logging.handlers
+import queue
 import sys
+from pathlib import Path
 from types import TracebackType
 from typing import Final
 
@@ -47,6 +53,18 @@ from src.utils.paths import log_path
 _LOG_MAX_BYTES: Final[int] = 1_048_576
 #: Number of rotated log files to retain on disk.
 _LOG_BACKUP_COUNT: Final[int] = 5
+#: Snapshot of ``sys.frozen`` – set by the bundler and constant afterwards.
+_IS_FROZEN: Final[bool] = bool(getattr(sys, "frozen", False))
+#: Structured-logging keys whose values must never reach a handler.
+_SENSITIVE_KEYS: Final[frozenset[str]] = frozenset({
+    "master_password",
+    "derived_key",
+    "password_clear",
+    "secret",
+})
+#: Timestamp format of the file sink – second resolution, see
+#: :class:`_FileFormatter`.
+_LOG_DATEFMT: Final[str] = "%Y-%m-%dT%H:%M:%S%z"
 
 # --------------------------------------------------------------------------- #
 # Redaction filter
@@ -61,8 +79,12 @@ class _RedactSecretsFilter(logging.Filter):
         log.info("user action", extra={"master_password": value})
 
     If ``record.args`` is a ``dict``, any key listed in
-    :pyattr:`_SENSITIVE_KEYS` is replaced with the literal string
-    ``"<redacted>"`` *in-place*.
+    :pydata:`_SENSITIVE_KEYS` is replaced with the literal string
+    ``"<redacted>"`` on the record.
+
+    ``LogRecord`` keeps a reference to the caller's own mapping, so that
+    dict is never mutated: a shallow copy is made (once, at C speed) and
+    only the matched keys are overwritten in it.
 
     Notes
     -----
@@ -72,17 +94,10 @@ class _RedactSecretsFilter(logging.Filter):
       down the handler chain.
     """
 
-    _SENSITIVE_KEYS: Final[set[str]] = {
-        "master_password",
-        "derived_key",
-        "password_clear",
-        "secret",
-    }
-
     # noqa: D401 – imperative mood for logging.Filter.filter
     def filter(self, record: logging.LogRecord) -> bool:  # type: ignore[override]
         """
-        Apply in-place redaction and allow the record through.
+        Apply redaction to the record and allow it through.
 
         Parameters
         ----------
@@ -94,30 +109,114 @@ class _RedactSecretsFilter(logging.Filter):
         bool
             Always ``True`` – record should be processed by handlers.
         """
-        if isinstance(record.args, dict):
-            record.args = {
-                k: ("<redacted>" if k in self._SENSITIVE_KEYS else v)
-                for k, v in record.args.items()
-            }
+        args = record.args
+        # Fast path: positional/None args fail the isinstance check, and
+        # most dict-style records carry no sensitive key at all.
+        if isinstance(args, dict):
+            # ``keys() & set`` walks the smaller operand – the 4-item
+            # sensitive set – whereas ``frozenset.intersection(dict)``
+            # would iterate every key of the record's dict.
+            hits = args.keys() & _SENSITIVE_KEYS
+            if hits:
+                redacted = dict(args)  # never mutate the caller's mapping
+                for key in hits:
+                    redacted[key] = "<redacted>"
+                record.args = redacted
         return True
 
 
+# --------------------------------------------------------------------------- #
+# File formatter
+# --------------------------------------------------------------------------- #
+
+
+class _FileFormatter(logging.Formatter):
+    """
+    Hard-wired equivalent of
+    ``"%(asctime)s | %(levelname)-8s | %(name)s | %(message)s"``.
+
+    Building the line with an f-string skips the ``%``-style template
+    machinery of :class:`logging.Formatter`, and the rendered timestamp is
+    reused for every record created within the same wall-clock second
+    (bursts usually are), so ``time.strftime`` runs at most once per
+    second.
+
+    Notes
+    -----
+    * The timestamp cache is only valid because :data:`_LOG_DATEFMT` has
+      second resolution.
+    * Instances are used by the single :class:`QueueListener` thread, so
+      the cache needs no locking.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(datefmt=_LOG_DATEFMT)
+        self._stamp_cache: tuple[int, str] = (-1, "")
+
+    def formatTime(  # noqa: N802 – overrides logging.Formatter
+        self, record: logging.LogRecord, datefmt: str | None = None
+    ) -> str:
+        second = int(record.created)
+        cached_second, stamp = self._stamp_cache
+        if second != cached_second:
+            stamp = super().formatTime(record, datefmt)
+            self._stamp_cache = (second, stamp)
+        return stamp
+
+    def format(self, record: logging.LogRecord) -> str:
+        record.message = record.getMessage()
+        record.asctime = self.formatTime(record, self.datefmt)
+        line = (
+            f"{record.asctime} | {record.levelname:<8} | "
+            f"{record.name} | {record.message}"
+        )
+        # Same exception / stack rendering as logging.Formatter.format().
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            if line[-1:] != "\n":
+                line += "\n"
+            line += record.exc_text
+        if record.stack_info:
+            if line[-1:] != "\n":
+                line += "\n"
+            line += self.formatStack(record.stack_info)
+        return line
+
+
 # --------------------------------------------------------------------------- #
 # Root logger configuration
 # --------------------------------------------------------------------------- #
 
+#: Set once :func:`_configure_root_logger` has installed handlers on root
+#: from this module instance.
+_CONFIGURED: bool = False
+
+#: File handlers keyed by log path.  A handler survives
+#: :func:`reset_configuration` only while its path is still the current
+#: ``log_path()``, so re-configuring for the same file reuses the open
+#: descriptor instead of reopening the log; :func:`logging.shutdown`
+#: closes whatever is left at interpreter exit.
+_FILE_HANDLER_POOL: dict[Path, logging.handlers.RotatingFileHandler] = {}
+
 
 def _configure_root_logger() -> None:
     """
     One-time initialisation of the *root* logger.
 
-    Adds:
+    Adds a single **QueueHandler** to the root logger that redacts secrets
+    and enqueues records.  A **QueueListener** thread drains the queue
+    into:
 
     * **RotatingFileHandler** (DEBUG) → ``log_path()``  
-      – captures everything, redacts secrets, rotates at 1 MiB × 5.
+      – captures everything, rotates at 1 MiB × 5.
     * **StreamHandler** (INFO) to *stdout* in *development* mode  
       – suppressed in frozen builds to keep packaged binaries silent.
 
+    The listener is exposed as ``queue_handler.listener`` (the attribute
+    :func:`logging.config.dictConfig` uses on 3.12+) and is stopped at
+    interpreter exit, which flushes any records still queued.
+
     Also:
 
     * Enables ``logging.captureWarnings(True)`` so ``warnings`` module
@@ -126,40 +225,60 @@ def _configure_root_logger() -> None:
       exceptions at *CRITICAL* before falling back to Python’s default
       behaviour (which prints tracebacks and returns non-zero).
     """
+    global _CONFIGURED
+
+    # Fast guard: plain module-global check on every later call.
+    if _CONFIGURED:
+        return
+
     root = logging.getLogger()
 
-    # Guard: only run once per interpreter.
+    # Guard: only run once per interpreter, even if another copy of this
+    # module (imported under a different dotted path) got there first.
+    # The flag is *not* set here – if that foreign handler is removed
+    # later, the next call must still configure root.
     if root.handlers:
         return
 
     root.setLevel(logging.DEBUG)
 
     # ---------- File handler ------------------------------------------------ #
-    file_handler = logging.handlers.RotatingFileHandler(
-        log_path(),
-        maxBytes=_LOG_MAX_BYTES,
-        backupCount=_LOG_BACKUP_COUNT,
-        encoding="utf-8",
-    )
-    file_handler.setLevel(logging.DEBUG)
-    file_handler.setFormatter(
-        logging.Formatter(
-            fmt="%(asctime)s | %(levelname)-8s | %(name)s | %(message)s",
-            datefmt="%Y-%m-%dT%H:%M:%S%z",
+    target: Path = log_path()
+    file_handler = _FILE_HANDLER_POOL.get(target)
+    if file_handler is None:
+        file_handler = logging.handlers.RotatingFileHandler(
+            target,
+            maxBytes=_LOG_MAX_BYTES,
+            backupCount=_LOG_BACKUP_COUNT,
+            encoding="utf-8",
         )
-    )
-    file_handler.addFilter(_RedactSecretsFilter())
-    root.addHandler(file_handler)
+        file_handler.setLevel(logging.DEBUG)
+        file_handler.setFormatter(_FileFormatter())
+        _FILE_HANDLER_POOL[target] = file_handler
+    sinks: list[logging.Handler] = [file_handler]
 
     # ---------- Console handler (development only) -------------------------- #
-    if not getattr(sys, "frozen", False):
+    if not _IS_FROZEN:
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setLevel(logging.INFO)
         console_handler.setFormatter(
             logging.Formatter("%(levelname)-8s | %(name)s | %(message)s")
         )
-        console_handler.addFilter(_RedactSecretsFilter())
-        root.addHandler(console_handler)
+        sinks.append(console_handler)
+
+    # ---------- Queue front-end -------------------------------------------- #
+    # Redaction must run on the caller's thread: QueueHandler.prepare()
+    # merges args into the message before the record is enqueued.
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.addFilter(_RedactSecretsFilter())
+    listener = logging.handlers.QueueListener(
+        log_queue, *sinks, respect_handler_level=True
+    )
+    queue_handler.listener = listener  # type: ignore[attr-defined]
+    root.addHandler(queue_handler)
+    listener.start()
+    atexit.register(listener.stop)
 
     # Capture stdlib warnings (e.g. DeprecationWarning)
     logging.captureWarnings(True)
@@ -180,10 +299,11 @@ def _configure_root_logger() -> None:
         sys.__excepthook__(exc_type, exc_value, exc_traceback)  # type: ignore[arg-type]
 
     sys.excepthook = _excepthook
+    _CONFIGURED = True
 
 
 # --------------------------------------------------------------------------- #
-# Public helper
+# Public helpers
 # --------------------------------------------------------------------------- #
 
 
@@ -203,5 +323,45 @@ def get_logger(name: str | None = None) -> logging.Logger:
     logging.Logger
         The requested logger instance.
     """
-    _configure_root_logger()
+    # Inline the flag check so the common, already-configured case costs
+    # one global lookup instead of a function call.
+    if not _CONFIGURED:
+        _configure_root_logger()
     return logging.getLogger(name)
+
+
+def reset_configuration() -> None:
+    """
+    Undo the root-logger configuration so the next :func:`get_logger`
+    call starts from scratch.
+
+    Stops every :class:`QueueListener` attached to a root handler –
+    flushing records still in its queue – closes the sinks it owns
+    (except pooled file handlers, which are reused by the next
+    configuration), detaches all root handlers and filters, and clears
+    the ``_CONFIGURED`` flag.  Pooled file handlers whose path is no
+    longer the current ``log_path()`` are closed and evicted, so the pool
+    never holds more than the one file the next configuration can reuse.
+    Intended for tests and for re-initialising logging without
+    re-importing this module.
+    """
+    global _CONFIGURED
+
+    root = logging.getLogger()
+    for handler in root.handlers:
+        listener = getattr(handler, "listener", None)
+        if isinstance(listener, logging.handlers.QueueListener):
+            atexit.unregister(listener.stop)
+            listener.stop()
+            pooled = _FILE_HANDLER_POOL.values()
+            for sink in listener.handlers:
+                if sink not in pooled:
+                    sink.close()
+
+    current: Path = log_path()
+    for path in [p for p in _FILE_HANDLER_POOL if p != current]:
+        _FILE_HANDLER_POOL.pop(path).close()
+
+    root.handlers.clear()
+    root.filters.clear()
+    _CONFIGURED = False
@@ -21,23 +21,62 @@ Functions
 db_path() -> Path
     Compute the correct location of ``vault.db`` for the current runtime
     context.
+
+All public helpers are memoised with :func:`functools.lru_cache`: their
+result is fixed for the lifetime of the process, so only the first call
+pays for the path construction and ``mkdir`` syscalls.
 """
 
 from __future__ import annotations
 
+import os
 import sys
+from functools import lru_cache
 from pathlib import Path
 from typing import Final
 
-from platformdirs import user_data_dir
-
 #: Application identifiers reused by ``platformdirs`` to build a
 #: per-user data directory in a cross-platform fashion.
 _APP_NAME: Final[str] = "Vaulture"
 _APP_AUTHOR: Final[str] = "DoD"
 _DB_FILE_NAME:Final[str] = "vault.db"
 
-
+#: ``sys.frozen`` is injected by the bundler before any user code runs and
+#: never changes afterwards, so it is snapshotted once at import.
+_IS_FROZEN: Final[bool] = bool(getattr(sys, "frozen", False))
+
+if _IS_FROZEN:
+    # Imported here rather than at module top so source/dev runs never
+    # load ``platformdirs`` at all.
+    from platformdirs import user_data_dir
+
+    #: Per-user data directory (``%APPDATA%\\Vaulture``,
+    #: ``~/.local/share/Vaulture`` …) holding the vault and the log file.
+    #: Resolved exactly once per process, and only in packaged builds.
+    _FROZEN_DATA_DIR: Final[Path] = Path(user_data_dir(_APP_NAME, _APP_AUTHOR))
+    #: Directory of the bundled executable; migrations ship next to it.
+    _FROZEN_EXEC_DIR: Final[Path] = Path(sys.executable).parent
+
+    # Create the data directory once per process; `mode=0o700` is vital
+    # on *nix systems so that other local accounts cannot peek at the vault.
+    _FROZEN_DATA_DIR.mkdir(parents=True, exist_ok=True, mode=0o700)
+
+#: Inner project root (``…/vaulture/vaulture``) when running from source.
+#: Resolved once at import and kept as a plain string: the dev-mode
+#: constants below are joined with ``os.path`` and only wrapped in a
+#: :class:`~pathlib.Path` once, instead of paying for pathlib parsing and
+#: normalisation on every intermediate ``/``.
+_PROJECT_ROOT: Final[str] = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+)
+
+#: Location of ``vault.db`` when running from source.
+_DEV_DB_PATH: Final[Path] = Path(
+    os.path.join(_PROJECT_ROOT, "src", "infrastructure", "database", "data", _DB_FILE_NAME)
+)
+
+
+@lru_cache(maxsize=1)
 def db_path() -> Path:  
     """
     Return the absolute filesystem path to *vault.db*.
@@ -49,7 +88,7 @@ def db_path() -> Path:
       - Place the database under the OS-correct *user data directory*,
         e.g. ``%APPDATA%\\Vaulture\\vault.db`` on Windows or
         ``~/.local/share/Vaulture/vault.db`` on Linux.  
-    - Create the directory tree on first run with permissions
+    - The directory tree is created at import with permissions
         ``0o700`` (owner RWX only) to prevent other local users from
         listing or reading its contents.
 
@@ -64,27 +103,14 @@ def db_path() -> Path:
     pathlib.Path
         Fully resolved path pointing to the *vault.db* file.
     """
-    if getattr(sys, "frozen", False):
-        # Running as a bundled executable. Use platformdirs to get a
-        # per-user location that follows the host OS guidelines.
-        db_dir: Path = Path(user_data_dir(_APP_NAME, _APP_AUTHOR))
-
-        # Ensure the directory exists; `mode=0o700` is vital on *nix
-        # systems so that other local accounts cannot peek at the vault.
-        db_dir.mkdir(parents=True, exist_ok=True, mode=0o700)
-
-        return db_dir / _DB_FILE_NAME
+    if _IS_FROZEN:
+        # Running as a bundled executable: per-user location that follows
+        # the host OS guidelines (already created at import).
+        return _FROZEN_DATA_DIR / _DB_FILE_NAME
 
     # Development/runtime from source: place the DB in the repo so it is
     # version-control-adjacent and easy to locate.
-    return (
-        Path(__file__).resolve().parents[2]
-        / "src"
-        / "infrastructure"
-        / "database"
-        / "data"
-        / _DB_FILE_NAME
-    )
+    return _DEV_DB_PATH
 
 
 
@@ -93,8 +119,11 @@ def db_path() -> Path:
 #: verbatim next to the executable in a frozen (PyInstaller, cx_Freeze)
 #: build so that migrations remain discoverable at runtime.
 _REL_MIGRATIONS: Final[str] = "src/infrastructure/database/migrations"
+#: Pre-joined migrations directory for source / development mode.
+_DEV_MIGRATIONS_PATH: Final[Path] = Path(os.path.join(_PROJECT_ROOT, _REL_MIGRATIONS))
 
 
+@lru_cache(maxsize=1)
 def migrations_path() -> Path:  
     """
     Return the absolute path of the *migrations* directory.
@@ -125,21 +154,22 @@ def migrations_path() -> Path:
     pathlib.Path
         Fully resolved path pointing to the migrations directory.
     """
-    if getattr(sys, "frozen", False):
+    if _IS_FROZEN:
         # e.g. …/Vaulture.exe → …/  (Windows)  |  …/Vaulture → …/ (Linux/macOS)
-        base: Path = Path(sys.executable).parent
-    else:
-        # utils/paths.py → utils → project_root
-        base: Path = Path(__file__).resolve().parents[2]
+        return _FROZEN_EXEC_DIR / _REL_MIGRATIONS
 
-    return base / _REL_MIGRATIONS
+    # utils/paths.py → utils → project_root / migrations
+    return _DEV_MIGRATIONS_PATH
 
 #: Folder that will *contain* the log file when running from source
 _LOG_DIR_NAME: Final[str] = "logs"
 #: Filename of the main application log
 _LOG_FILE_NAME: Final[str] = "vaulture.log"
+#: Pre-joined log directory for source / development mode.
+_DEV_LOG_DIR: Final[Path] = Path(os.path.join(_PROJECT_ROOT, _LOG_DIR_NAME))
 
 
+@lru_cache(maxsize=1)
 def log_path() -> Path:  # noqa: D401
     """
     Return the absolute path where Vaulture should write its log file.
@@ -158,22 +188,24 @@ def log_path() -> Path:  # noqa: D401
     Side effects
     ------------
     * Ensures the parent directory exists and is created with
-      permissions ``0o700`` (owner read/write/execute only).
+      permissions ``0o700`` (owner read/write/execute only).  In frozen
+      builds this already happened at import; in dev mode it happens on
+      the first call only, as the result is cached for the process.
 
     Returns
     -------
     pathlib.Path
         Fully resolved path to *vaulture.log*.
     """
-    if getattr(sys, "frozen", False):
+    if _IS_FROZEN:
         # e.g. ~/.local/share/Vaulture  |  %APPDATA%\Vaulture
-        base_dir: Path = Path(user_data_dir(_APP_NAME, _APP_AUTHOR))
-    else:
-        # utils/paths.py -> utils -> project_root / logs
-        base_dir: Path = Path(__file__).resolve().parents[2] / _LOG_DIR_NAME
+        # The directory was already created (0o700) at import.
+        return _FROZEN_DATA_DIR / _LOG_FILE_NAME
 
+    # utils/paths.py -> utils -> project_root / logs
     # Create the directory tree securely; `exist_ok=True` prevents races
-    # on subsequent calls, and `0o700` keeps other local users out.
-    base_dir.mkdir(parents=True, exist_ok=True, mode=0o700)
+    # with other processes, and `0o700` keeps other local users out.  The
+    # lru_cache above guarantees this syscall runs once per process.
+    _DEV_LOG_DIR.mkdir(parents=True, exist_ok=True, mode=0o700)
 
-    return base_dir / _LOG_FILE_NAME
\ No newline at end of file
+    return _DEV_LOG_DIR / _LOG_FILE_NAME
\ No newline at end of file
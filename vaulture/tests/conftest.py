@@ -1,4 +1,5 @@
 # vaulture/vaulture/tests/conftest.py
+import os
 import sys
 from pathlib import Path
 import logging
@@ -8,8 +9,12 @@ from pytest import MonkeyPatch
 # --------------------------------------------------------------------------- #
 # Make the inner vaulture/ (which contains src/) importable                   #
 # --------------------------------------------------------------------------- #
-PACKAGE_ROOT = Path(__file__).resolve().parents[1]      # …/vaulture/vaulture
-sys.path.insert(0, str(PACKAGE_ROOT))
+# The code imports itself as ``src.…`` (there is no installable package), so
+# the inner project root has to be on sys.path – but only once.
+# Pure string ops – no realpath()/lstat walk is needed just to extend sys.path.
+PACKAGE_ROOT = Path(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # …/vaulture/vaulture
+if str(PACKAGE_ROOT) not in sys.path:
+    sys.path.insert(0, str(PACKAGE_ROOT))
 
 # --------------------------------------------------------------------------- #
 # Isolation fixture: real handler, but to a tmp file                          #
@@ -17,16 +22,19 @@ sys.path.insert(0, str(PACKAGE_ROOT))
 @pytest.fixture(autouse=True)
 def _isolate_logging(tmp_path: Path, monkeypatch: MonkeyPatch): # type:ignore
     """
-    Redirect paths.log_path() to tmp_path so RotatingFileHandler still
-    exists (tests rely on it) but writes only to an ephemeral file.
+    Redirect paths.log_path() to a per-test tmp file so
+    RotatingFileHandler still exists (tests rely on it) but writes only
+    to an ephemeral file no other test can write into.
     Also start/finish each test with a pristine root logger.
     """
-    # 1️⃣  Pretend the log lives in the tmp dir
-    monkeypatch.setattr(
-        "src.utils.paths.log_path",
-        lambda: tmp_path / "vaulture_test.log",
-        raising=False,
-    )
+    # 1️⃣  Pretend the log lives in the tmp dir – both at the source and in
+    #     the logging module, which binds the name at import.  That way an
+    #     already-imported logging module does not have to be re-imported
+    #     to pick up the redirect.
+    log_file = tmp_path / "vaulture_test.log"
+    fake_log_path = lambda: log_file  # noqa: E731
+    monkeypatch.setattr("src.utils.paths.log_path", fake_log_path, raising=False)
+    monkeypatch.setattr("src.utils.logging.log_path", fake_log_path, raising=False)
 
     # 2️⃣  Clean-slate root logger
     root = logging.getLogger()
@@ -35,6 +43,9 @@ def _isolate_logging(tmp_path: Path, monkeypatch: MonkeyPatch): # type:ignore
 
     yield  # ---- run the test ----
 
-    # 3️⃣  Ensure no handlers leak between tests
+    # 3️⃣  Ensure no handlers (or queue-listener threads) leak between tests
+    log_mod = sys.modules.get("src.utils.logging")
+    if log_mod is not None:
+        log_mod.reset_configuration()
     root.handlers.clear()
     root.filters.clear()
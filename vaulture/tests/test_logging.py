@@ -1,8 +1,8 @@
 
-# vaulture/src/tests/test_logging.py
+# vaulture/vaulture/tests/test_logging.py
 
 """
-Regression tests for *vaulture.src.utils.logging*.
+Regression tests for *src.utils.logging*.
 
 The goal is to guarantee that the project-wide logging bootstrap
 performs **exactly one** root-level initialisation—even if the module is
@@ -17,9 +17,9 @@ Why this matters
 * Conflicting handler state ⇒ rotation limits or formatter settings may
   diverge between copies.
 
-The test uses `pytest.MonkeyPatch` to evict the module from
-`sys.modules`, simulating a *fresh* interpreter import without having to
-spawn a subprocess.
+The tests call `reset_configuration()` to return the root logger to a
+pristine, unconfigured state, simulating a *fresh* interpreter without
+re-importing the module or spawning a subprocess.
 
 
 
@@ -39,6 +39,9 @@ stdout, violating Vaulture’s privacy guarantees.
 
 import sys, importlib, logging
 from logging.handlers import RotatingFileHandler
+from pathlib import Path
+from types import ModuleType
+import pytest
 from pytest import MonkeyPatch
 from _pytest.logging import LogCaptureFixture
 
@@ -55,11 +58,13 @@ PKG: str = "src.utils.logging"
 # --------------------------------------------------------------------------- #
 def _reload_logging(_: MonkeyPatch):  # noqa: D401
     """
-    Remove *vaulture.src.utils.logging* from `sys.modules` and re-import.
+    Return the logging module with its configuration reset.
 
-    This forces a *cold* import so the root-logger configuration code
-    (`_configure_root_logger`) executes again, allowing us to validate
-    that it installs handlers **idempotently**.
+    `reset_configuration()` stops the queue listener, drops every root
+    handler and clears the "configured" flag, so the root-logger
+    configuration code (`_configure_root_logger`) executes again on the
+    next `get_logger` call, allowing us to validate that it installs
+    handlers **idempotently**.
 
     Parameters
     ----------
@@ -70,18 +75,20 @@ def _reload_logging(_: MonkeyPatch):  # noqa: D401
     Returns
     -------
     module
-        The freshly imported logging configuration module.
+        The logging configuration module, in an unconfigured state.
     """
-    sys.modules.pop(PKG, None)  # Forget any prior import.
-    root = logging.getLogger()
-    root.handlers.clear()
-    root.filters.clear()
-    return importlib.import_module(PKG)
+    mod = importlib.import_module(PKG)
+    mod.reset_configuration()
+    return mod
 
 
 def _n_file_handlers() -> int:
     """
-    Count *RotatingFileHandler* instances attached to the root logger.
+    Count *RotatingFileHandler* instances fed by the root logger.
+
+    Handlers sitting behind a `QueueHandler` are reached through its
+    `listener` attribute.  The bootstrap instantiates the class itself,
+    so an exact `type(...) is` check suffices (no MRO walk).
 
     Returns
     -------
@@ -89,11 +96,30 @@ def _n_file_handlers() -> int:
         Number of `RotatingFileHandler` objects currently registered.
     """
     return sum(
-        isinstance(h, RotatingFileHandler)
+        type(sink) is RotatingFileHandler
         for h in logging.getLogger().handlers
+        for sink in getattr(getattr(h, "listener", None), "handlers", (h,))
     )
 
 
+@pytest.fixture
+def fresh_logging(monkeypatch: MonkeyPatch, caplog: LogCaptureFixture) -> ModuleType:
+    """
+    Configured logging module with pytest's capture handler attached.
+
+    Resets and re-configures the root logger (installing the handlers and
+    the `sys.excepthook` override), then re-attaches `caplog.handler` –
+    which the reset detached – *after* configuration, so the bootstrap's
+    "root already has handlers" guard is not tripped.  Captures DEBUG
+    and above.
+    """
+    mod = _reload_logging(monkeypatch)
+    mod.get_logger()
+    logging.getLogger().addHandler(caplog.handler)
+    caplog.set_level(logging.DEBUG)
+    return mod
+
+
 # --------------------------------------------------------------------------- #
 # Tests                                                                       #
 # --------------------------------------------------------------------------- #
@@ -105,8 +131,10 @@ def test_single_initialisation(monkeypatch: MonkeyPatch) -> None:
     -----
     1.  Reload the logging module in a pristine state.
     2.  Call `get_logger` once → should create **one** handler.
-    3.  Import the module *again* (simulating transient re-imports) →
-        handler count must stay unchanged.
+    3.  Re-run the module's initialisation (what a transient re-import
+        under a fresh namespace does – its "configured" flag starts out
+        unset) and call `get_logger` again → handler count must stay
+        unchanged.
     """
     mod = _reload_logging(monkeypatch)
 
@@ -114,22 +142,91 @@ def test_single_initialisation(monkeypatch: MonkeyPatch) -> None:
     mod.get_logger(__name__)
     assert _n_file_handlers() == 1
 
-    # Re-importing the module should be a no-op regarding handler count.
-    importlib.import_module(PKG)
+    # Re-executing the module resets its flag; the root-logger guard must
+    # still turn the second configuration into a no-op.  Running the loader
+    # directly avoids a full import-machinery pass for a module that is
+    # already in sys.modules.
+    mod.__spec__.loader.exec_module(mod)  # type: ignore[union-attr]
+    assert mod._CONFIGURED is False
+    mod.get_logger(__name__)
     assert (
         _n_file_handlers() == 1
     ), "Duplicate RotatingFileHandlers detected – logging is not idempotent"
 
-def test_redaction_filter(monkeypatch: MonkeyPatch, caplog: LogCaptureFixture):   
+def test_foreign_handler_does_not_latch_configuration(monkeypatch: MonkeyPatch) -> None:
+    """
+    A handler someone else put on root makes `get_logger()` back off – but
+    only for as long as it is there.  Once it is removed, the next call
+    must install the real sinks instead of leaving root empty.
+    """
+    mod = _reload_logging(monkeypatch)
+    root = logging.getLogger()
+
+    foreign = logging.NullHandler()
+    root.addHandler(foreign)
+    mod.get_logger(__name__)
+    assert root.handlers == [foreign]
+    assert mod._CONFIGURED is False
+
+    root.removeHandler(foreign)
+    mod.get_logger("a")
+    assert _n_file_handlers() == 1
+    assert mod._CONFIGURED is True
+
+
+def test_file_handler_reused_after_reset(monkeypatch: MonkeyPatch) -> None:
+    """
+    Re-configuring after `reset_configuration()` must reuse the pooled
+    `RotatingFileHandler` (same open stream) instead of reopening the log.
+    """
+    def _file_handler() -> RotatingFileHandler:
+        (queue_handler,) = logging.getLogger().handlers
+        (sink,) = [
+            h for h in queue_handler.listener.handlers  # type: ignore[attr-defined]
+            if type(h) is RotatingFileHandler
+        ]
+        return sink
+
+    mod = _reload_logging(monkeypatch)
+    mod.get_logger(__name__)
+    first = _file_handler()
+
+    mod = _reload_logging(monkeypatch)
+    mod.get_logger(__name__)
+    second = _file_handler()
+
+    assert second is first
+    assert second.stream is not None and not second.stream.closed
+
+
+def test_file_handler_evicted_when_path_changes(monkeypatch: MonkeyPatch,
+                                                 tmp_path: Path) -> None:
+    """
+    Once `log_path()` points elsewhere, `reset_configuration()` must close
+    the pooled handler for the old file and drop it from the pool.
+    """
+    mod = _reload_logging(monkeypatch)
+    mod.get_logger(__name__)
+    old_path = mod.log_path()
+    old = mod._FILE_HANDLER_POOL[old_path]
+
+    new_path = tmp_path / "moved.log"
+    monkeypatch.setattr(mod, "log_path", lambda: new_path)
+    mod.reset_configuration()
+
+    assert old_path not in mod._FILE_HANDLER_POOL
+    assert old.stream is None  # FileHandler.close() drops the stream
+
+def test_redaction_filter(fresh_logging: ModuleType, caplog: LogCaptureFixture):   
     """Verify that the redaction filter replaces sensitive values
         with the literal string ``"<redacted>"`` **and** leaves non-sensitive
         keys untouched.
 
         Steps performed:
-            1. Reload the logging module so that each test starts
-            with a *clean* root logger (handled by ``_reload_logging``).
-            2. Re-attach pytest’s capture handler after the reload
-            to intercept records post-filtering.
+            1. Start from a freshly configured root logger with
+            pytest’s capture handler re-attached after the handlers, so
+            it intercepts records post-filtering (``fresh_logging``).
+            2. Obtain a namespaced logger.
             3. Emit a DEBUG record containing both sensitive
             (``master_password``) and ordinary (``service``) data.
             4. Assert:
@@ -139,28 +236,18 @@ def test_redaction_filter(monkeypatch: MonkeyPatch, caplog: LogCaptureFixture):
                 • the non-sensitive key remains unchanged.
         """
 
-    # Reload the logging configuration so the root logger is pristine.
-    log_mod = _reload_logging(monkeypatch)
-
-    # Obtain a namespaced logger; the first call triggers config.
-    log = log_mod.get_logger("test.redact")
-
-    # pytest’s caplog fixture was detached by _reload_logging → add it back.
-    root = logging.getLogger()
-    root.addHandler(caplog.handler)
-    caplog.set_level(logging.DEBUG)          # capture everything
+    # Obtain a namespaced logger from the freshly configured module.
+    log = fresh_logging.get_logger("test.redact")
 
     # ------------------------------------------------------------------ #
     # Emit a structured DEBUG record that should be filtered.            #
     # ------------------------------------------------------------------ #
-    log.debug(
-        "saving %(service)s credentials",
-        {
-            "service": "github.com",
-            "master_password": "hunter2",
-            "username": "dod",
-        },
-    )
+    payload = {
+        "service": "github.com",
+        "master_password": "hunter2",
+        "username": "dod",
+    }
+    log.debug("saving %(service)s credentials", payload)
 
     # ------------------------------------------------------------------ #
     # Assertions                                                         #
@@ -175,17 +262,48 @@ def test_redaction_filter(monkeypatch: MonkeyPatch, caplog: LogCaptureFixture):
     assert record.args["master_password"] == "<redacted>"  # type: ignore[index]
     # Non-sensitive key is untouched.
     assert record.args["service"] == "github.com"           # type: ignore[index]
+    # The caller's own dict must not be modified by the filter.
+    assert payload["master_password"] == "hunter2"
 
-def test_uncaught_exception_hook(monkeypatch: MonkeyPatch,
-                                 caplog: LogCaptureFixture) -> None:
-    # Reload the logging config to install the sys.excepthook override.
-    log_mod = _reload_logging(monkeypatch)
+def test_redaction_filter_fast_paths() -> None:
+    """
+    Records that need no redaction must pass through untouched:
+    positional tuples, no args at all, and dict args without sensitive
+    keys keep the *same* object (no copy is made).
+    """
+    log_mod = importlib.import_module(PKG)
+    redact = log_mod._RedactSecretsFilter()
+
+    clean = {"service": "github.com"}
+    for args in (("github.com",), None, clean):
+        record = logging.LogRecord("test.redact", logging.DEBUG, __file__, 1,
+                                   "msg", None, None)
+        record.args = args
+        assert redact.filter(record) is True
+        assert record.args is args
+
+def test_redaction_reaches_file_sink(fresh_logging: ModuleType) -> None:
+    """
+    The file sink sits behind the QueueListener, so redaction has to run
+    on the QueueHandler *before* `prepare()` renders args into the
+    message.  Log a secret through the real queue, stop the listener
+    (which flushes it) and read what actually landed on disk.
+    """
+    log_file = fresh_logging.log_path()
 
-    # Re-attach pytest’s capture handler to the root logger,
-    # since _reload_logging clears all handlers.
-    root = logging.getLogger()
-    root.addHandler(caplog.handler)
-    caplog.set_level(logging.CRITICAL)
+    log = fresh_logging.get_logger("test.redact.file")
+    log.debug("pw=%(master_password)s", {"master_password": "hunter2"})
+    fresh_logging.reset_configuration()  # stop listener → queue drained
+
+    text = log_file.read_text(encoding="utf-8")
+    assert "pw=<redacted>" in text
+    assert "hunter2" not in text
+
+def test_uncaught_exception_hook(fresh_logging: ModuleType,
+                                 caplog: LogCaptureFixture) -> None:
+    # `fresh_logging` configured the root logger, which installs the
+    # sys.excepthook override, and re-attached pytest's capture handler.
+    log_mod = fresh_logging
 
     # -------- fabricate an exception --------
     try:
@@ -215,4 +333,32 @@ def test_uncaught_exception_hook(monkeypatch: MonkeyPatch,
     # Sanity-check: traceback contains the test function or module-level line
     import traceback
     tb_list = traceback.extract_tb(rec.exc_info[2])
-    assert tb_list[-1].name == "<module>" or tb_list[-1].name == "test_uncaught_exception_hook"
\ No newline at end of file
+    assert tb_list[-1].name == "<module>" or tb_list[-1].name == "test_uncaught_exception_hook"
+
+def test_file_formatter_matches_template() -> None:
+    """
+    `_FileFormatter` must render exactly what the equivalent `%`-style
+    `logging.Formatter` would, including a cached timestamp for a second
+    record within the same second and an appended traceback.
+    """
+    log_mod = importlib.import_module(PKG)
+    fast = log_mod._FileFormatter()
+    reference = logging.Formatter(
+        fmt="%(asctime)s | %(levelname)-8s | %(name)s | %(message)s",
+        datefmt=log_mod._LOG_DATEFMT,
+    )
+
+    try:
+        1 / 0  # type:ignore
+    except ZeroDivisionError:
+        exc_info = sys.exc_info()
+
+    records = [
+        logging.LogRecord("test.fmt", logging.INFO, __file__, 1,
+                          "hello %s", ("world",), None),
+        logging.LogRecord("test.fmt", logging.ERROR, __file__, 2,
+                          "boom", None, exc_info),
+    ]
+    for record in records:
+        expected = reference.format(logging.makeLogRecord(record.__dict__))
+        assert fast.format(record) == expected
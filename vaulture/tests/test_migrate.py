@@ -1,4 +1,4 @@
-# vaulture/tests/test_migrate.py
+# vaulture/vaulture/tests/test_migrate.py
 
 """
 Test suite for: src/infrastructure/database/migrate.py
@@ -10,8 +10,14 @@ SQLite migration runner. It ensures:
 - Filtering and ordering of pending migrations.
 - Actual execution of SQL files with PRAGMA version tracking.
 - Protection against partial state on failure (via transaction rollback).
+
+Nothing here asserts on log output, so when iterating on migrations the
+module can be run without pytest's log-capture plugin:
+
+    pytest -p no:logging tests/test_migrate.py tests/test_paths.py
 """
 
+import os
 import sys
 import importlib
 import sqlite3
@@ -22,24 +28,89 @@ import pytest
 from pytest import MonkeyPatch
 
 
-# Make sure `src/` is on sys.path so we can import internal modules directly
-project_root = Path(__file__).resolve().parents[1]
-src_dir = project_root / "src"
-if str(src_dir) not in sys.path:
-    sys.path.insert(0, str(src_dir))
-
 PKG = "src.infrastructure.database.migrate"  # Single source of truth for reloading
 
 
 def _reload_module(_: MonkeyPatch | None = None) -> ModuleType:
     """
-    Force a clean import of the migration module.
+    Re-execute the migration module, importing it on first use.
+
+    This gives every test fresh `lru_cache`s and module-level functions
+    like `_list_sql_files()` or `_connect()` to monkeypatch.  Once the
+    module is cached, its own loader re-runs it in the existing namespace
+    without walking the `sys.meta_path` finders again.
+    """
+    mod = sys.modules.get(PKG)
+    if mod is None:
+        return importlib.import_module(PKG)
+    mod.__spec__.loader.exec_module(mod)  # type: ignore[union-attr]
+    return mod
+
 
-    This enables monkeypatching of module-level functions like
-    `_list_sql_files()` or `_connect()` that are otherwise cached.
+def _mem_conn(name: str) -> sqlite3.Connection:
     """
-    sys.modules.pop(PKG, None)
-    return importlib.import_module(PKG)
+    Open a *named*, shared-cache in-memory database with foreign keys on.
+
+    Every connection opened with the same `name` sees the same database
+    for as long as one of them stays open, so a test can inspect the
+    state left behind by the code under test through a second connection
+    – something a plain `":memory:"` connection cannot offer.
+    """
+    conn = sqlite3.connect(f"file:{name}?mode=memory&cache=shared", uri=True)
+    conn.execute("PRAGMA foreign_keys = ON")
+    return conn
+
+
+def _fast_write(p: Path, data: bytes) -> None:
+    """
+    Write an ASCII migration body straight to `p` with raw `os` calls.
+
+    `Path.write_text()` goes through `io.TextIOWrapper` and an encode
+    step for every file; the SQL fixtures here are plain bytes already.
+    """
+    fd = os.open(p, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, data)
+    finally:
+        os.close(fd)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# _connect
+# ─────────────────────────────────────────────────────────────────────────────
+
+def test_connect_sets_pragmas(monkeypatch: MonkeyPatch, tmp_path: Path) -> None:
+    """
+    _connect() should open db_path() with foreign keys enforced and
+    leave the file's journal mode at SQLite's default.
+    """
+    mod = _reload_module(monkeypatch)
+    monkeypatch.setattr(mod, "db_path", lambda: tmp_path / "vault.db", raising=True)
+
+    conn = mod._connect()
+    try:
+        assert conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+    finally:
+        conn.close()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# _list_sql_files
+# ─────────────────────────────────────────────────────────────────────────────
+
+def test_list_sql_files(monkeypatch: MonkeyPatch, tmp_path: Path) -> None:
+    """
+    Only regular `*.sql` files are listed, sorted by name.
+    """
+    for name in ("002_b.sql", "001_a.sql", "README.md", "__init__.py"):
+        _fast_write(tmp_path / name, b"-- no-op\n")
+    (tmp_path / "003_dir.sql").mkdir()  # directories are skipped
+
+    mod = _reload_module(monkeypatch)
+    monkeypatch.setattr(mod, "migrations_path", lambda: tmp_path, raising=True)
+
+    assert mod._list_sql_files() == [tmp_path / "001_a.sql", tmp_path / "002_b.sql"]
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -74,6 +145,11 @@ def test_extract_prefix_invalid(monkeypatch: MonkeyPatch) -> None:
     with pytest.raises(ValueError):
         mod._extract_prefix(Path("abc.sql"))
 
+    # int() alone would accept these – the prefix must be plain digits.
+    for name in ("+1_sign.sql", " 1_space.sql", "\u0661_arabic_digit.sql"):
+        with pytest.raises(ValueError):
+            mod._extract_prefix(Path(name))
+
 
 # ─────────────────────────────────────────────────────────────────────────────
 # _pending_migrations
@@ -90,24 +166,49 @@ def test_pending_migrations(monkeypatch: MonkeyPatch, tmp_path: Path) -> None:
     files = [
         tmp_path / "001_init.sql",
         tmp_path / "002_add_email.sql",
-        tmp_path / "004_index.sql",
+        tmp_path / "9_cleanup.sql",     # not zero-padded …
+        tmp_path / "010_index.sql",     # … so it sorts *after* 010 by name
     ]
     for f in files:
-        f.write_text("-- no-op\n")
+        _fast_write(f, b"-- no-op\n")
 
     mod = _reload_module(monkeypatch)
 
-    # Monkeypatch _list_sql_files() to return our test files
+    # Monkeypatch _list_sql_files() to return our test files in name order
     monkeypatch.setattr(mod, "_list_sql_files", lambda: sorted(files), raising=True)
 
-    # Version 1: should apply 2 and 4
-    assert mod._pending_migrations(1) == [(2, files[1]), (4, files[2])]
+    # Version 1: should apply 2, 9 and 10 – in version order
+    assert mod._pending_migrations(1) == [(2, files[1]), (9, files[2]), (10, files[3])]
+
+    # Version 9: should apply only 10
+    assert mod._pending_migrations(9) == [(10, files[3])]
+
+    # Version 10: up-to-date → nothing to do
+    assert mod._pending_migrations(10) == []
+
+
+def test_pending_migrations_index_is_cached(monkeypatch: MonkeyPatch, tmp_path: Path) -> None:
+    """
+    The sorted (version, Path) index is built once and reused by every
+    `_pending_migrations` call until its cache is cleared.
+    """
+    files = [tmp_path / "001_init.sql", tmp_path / "002_add_email.sql"]
+    calls: list[int] = []
+
+    def fake_list_sql_files() -> list[Path]:
+        calls.append(1)
+        return files
 
-    # Version 3: should apply only 4
-    assert mod._pending_migrations(3) == [(4, files[2])]
+    mod = _reload_module(monkeypatch)
+    monkeypatch.setattr(mod, "_list_sql_files", fake_list_sql_files, raising=True)
+
+    assert mod._pending_migrations(0) == [(1, files[0]), (2, files[1])]
+    assert mod._pending_migrations(1) == [(2, files[1])]
+    assert len(calls) == 1
 
-    # Version 4: up-to-date → nothing to do
-    assert mod._pending_migrations(4) == []
+    mod._sorted_migrations.cache_clear()
+    assert mod._pending_migrations(2) == []
+    assert len(calls) == 2
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -124,12 +225,11 @@ def test_apply_migration_in_memory(tmp_path: Path, monkeypatch: MonkeyPatch) ->
     - Asserts the table exists.
     - Asserts `PRAGMA user_version` is updated atomically.
     """
-    conn = sqlite3.connect(":memory:")
-    conn.execute("PRAGMA foreign_keys = ON")
+    conn = _mem_conn("apply_migration")
 
     # Create a simple migration file
     sql_file = tmp_path / "001_create_table.sql"
-    sql_file.write_text("CREATE TABLE foo(id INTEGER PRIMARY KEY);", encoding="utf-8")
+    _fast_write(sql_file, b"CREATE TABLE foo(id INTEGER PRIMARY KEY);")
 
     mod = _reload_module(monkeypatch)
     mod._apply_migration(conn, sql_file, version=1)
@@ -141,13 +241,49 @@ def test_apply_migration_in_memory(tmp_path: Path, monkeypatch: MonkeyPatch) ->
     # Version updated
     cur = conn.execute("PRAGMA user_version")
     assert cur.fetchone()[0] == 1
+    conn.close()
 
 
 # ─────────────────────────────────────────────────────────────────────────────
 # run() – full migration flow
 # ─────────────────────────────────────────────────────────────────────────────
 
-def test_run_applies_all_migrations(monkeypatch: MonkeyPatch, tmp_path: Path) -> None:
+_SHARED_DB = "run_shared"
+
+
+@pytest.fixture(scope="module")
+def shared_conn():  # type: ignore
+    """
+    One named in-memory database for every `test_run_*` in this module.
+
+    `run()` only uses its connection as a transaction context manager and
+    never closes it, so the same connection can be handed to it again and
+    again instead of paying for a fresh connect + pragmas per test.
+    """
+    conn = _mem_conn(_SHARED_DB)
+    yield conn
+    conn.close()
+
+
+@pytest.fixture
+def reset_db(shared_conn: sqlite3.Connection) -> sqlite3.Connection:
+    """
+    Hand out `shared_conn` with no open transaction, no tables and
+    `user_version = 0` – i.e. a brand-new, never-migrated database.
+    """
+    shared_conn.rollback()
+    tables = shared_conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table'"
+    ).fetchall()
+    shared_conn.executescript(
+        "PRAGMA foreign_keys = OFF;\n"
+        + "".join(f'DROP TABLE IF EXISTS "{name}";\n' for (name,) in tables)
+        + "PRAGMA user_version = 0;\nPRAGMA foreign_keys = ON;"
+    )
+    return shared_conn
+
+def test_run_applies_all_migrations(monkeypatch: MonkeyPatch, tmp_path: Path,
+                                    reset_db: sqlite3.Connection) -> None:
     """
     run() should:
     - Connect to DB
@@ -159,33 +295,27 @@ def test_run_applies_all_migrations(monkeypatch: MonkeyPatch, tmp_path: Path) ->
         tmp_path / "001_create.sql",
         tmp_path / "002_insert.sql",
     ]
-    files[0].write_text("CREATE TABLE foo(id INTEGER PRIMARY KEY);", encoding="utf-8")
-    files[1].write_text("INSERT INTO foo(id) VALUES (42);", encoding="utf-8")
+    _fast_write(files[0], b"CREATE TABLE foo(id INTEGER PRIMARY KEY);")
+    _fast_write(files[1], b"INSERT INTO foo(id) VALUES (42);")
 
     mod = _reload_module(monkeypatch)
 
     # Monkeypatch: migration file list and DB connection path
     monkeypatch.setattr(mod, "_list_sql_files", lambda: sorted(files), raising=True)
 
-    db_file = tmp_path / "vault.db"
-
-    def fake_connect():
-        conn = sqlite3.connect(db_file)
-        conn.execute("PRAGMA foreign_keys = ON")
-        return conn
-
-    monkeypatch.setattr(mod, "_connect", fake_connect, raising=True)
+    monkeypatch.setattr(mod, "_connect", lambda: reset_db, raising=True)
 
     mod.run()  # Run the full migration engine
 
-    # Validate state in real file-based DB
-    conn = sqlite3.connect(db_file)
-    assert conn.execute("PRAGMA user_version").fetchone()[0] == 2
-    assert conn.execute("SELECT COUNT(*) FROM foo").fetchone()[0] == 1
-    conn.close()
+    # Validate the committed state through a second connection
+    check = _mem_conn(_SHARED_DB)
+    assert check.execute("PRAGMA user_version").fetchone()[0] == 2
+    assert check.execute("SELECT COUNT(*) FROM foo").fetchone()[0] == 1
+    check.close()
 
 
-def test_run_rolls_back_on_error(monkeypatch: MonkeyPatch, tmp_path: Path) -> None:
+def test_run_rolls_back_on_error(monkeypatch: MonkeyPatch, tmp_path: Path,
+                                 reset_db: sqlite3.Connection) -> None:
     """
     If a migration has syntax errors:
     - run() must raise an exception
@@ -193,17 +323,76 @@ def test_run_rolls_back_on_error(monkeypatch: MonkeyPatch, tmp_path: Path) -> No
     - PRAGMA user_version must not change
     """
     bad_sql = tmp_path / "001_broken.sql"
-    bad_sql.write_text("CREATE TABLE broken(", encoding="utf-8")  # invalid SQL
+    _fast_write(bad_sql, b"CREATE TABLE broken(")  # invalid SQL
 
     mod = _reload_module(monkeypatch)
 
-    # Inject the bad file and in-memory DB
+    # Inject the bad file and the shared in-memory DB
     monkeypatch.setattr(mod, "_list_sql_files", lambda: [bad_sql], raising=True)
-    monkeypatch.setattr(mod, "_connect", lambda: sqlite3.connect(":memory:"), raising=True)
+    monkeypatch.setattr(mod, "_connect", lambda: reset_db, raising=True)
 
     with pytest.raises(sqlite3.Error):
         mod.run()
 
-    # Validate that no version bump happened
-    conn = sqlite3.connect(":memory:")
-    assert conn.execute("PRAGMA user_version").fetchone()[0] == 0
+    # Validate through a second connection to the *same* database that
+    # no version bump happened
+    check = _mem_conn(_SHARED_DB)
+    assert check.execute("PRAGMA user_version").fetchone()[0] == 0
+    check.close()
+
+
+def test_run_is_atomic_across_migrations(monkeypatch: MonkeyPatch, tmp_path: Path,
+                                         reset_db: sqlite3.Connection) -> None:
+    """
+    Pending migrations are applied as one batch:
+    - A failure in a later file rolls back the earlier ones too
+    - PRAGMA user_version stays at its previous value
+    """
+    files = [
+        tmp_path / "001_create.sql",
+        tmp_path / "002_broken.sql",
+    ]
+    # Trailing comment without newline must not swallow the next statement
+    _fast_write(files[0], b"CREATE TABLE foo(id INTEGER PRIMARY KEY) -- ok")
+    _fast_write(files[1], b"CREATE TABLE broken(")  # invalid SQL
+
+    mod = _reload_module(monkeypatch)
+    monkeypatch.setattr(mod, "_list_sql_files", lambda: sorted(files), raising=True)
+
+    monkeypatch.setattr(mod, "_connect", lambda: reset_db, raising=True)
+
+    with pytest.raises(sqlite3.Error):
+        mod.run()
+
+    check = _mem_conn(_SHARED_DB)
+    assert check.execute("PRAGMA user_version").fetchone()[0] == 0
+    assert check.execute("SELECT name FROM sqlite_master WHERE name='foo'").fetchone() is None
+    check.close()
+
+
+def test_run_rejects_transaction_only_statements(monkeypatch: MonkeyPatch, tmp_path: Path,
+                                                 reset_db: sqlite3.Connection) -> None:
+    """
+    Migrations run inside the batch transaction, which pins two limits
+    documented on `_apply_migrations()`:
+    - `PRAGMA foreign_keys = OFF` is a silent no-op
+    - `VACUUM` fails the whole batch
+    """
+    fk_off = tmp_path / "001_fk_off.sql"
+    _fast_write(fk_off, b"PRAGMA foreign_keys = OFF;\nCREATE TABLE fk_state AS "
+                        b"SELECT foreign_keys FROM pragma_foreign_keys;")
+    vacuum = tmp_path / "002_vacuum.sql"
+    _fast_write(vacuum, b"VACUUM;")
+
+    mod = _reload_module(monkeypatch)
+    monkeypatch.setattr(mod, "_connect", lambda: reset_db, raising=True)
+
+    monkeypatch.setattr(mod, "_list_sql_files", lambda: [fk_off], raising=True)
+    mod.run()
+    assert reset_db.execute("SELECT foreign_keys FROM fk_state").fetchone()[0] == 1
+
+    mod._sorted_migrations.cache_clear()
+    monkeypatch.setattr(mod, "_list_sql_files", lambda: [fk_off, vacuum], raising=True)
+    with pytest.raises(sqlite3.OperationalError):
+        mod.run()
+    assert reset_db.execute("PRAGMA user_version").fetchone()[0] == 1
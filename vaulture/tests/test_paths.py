@@ -1,43 +1,78 @@
-# vaulture/tests/test_path.py
-import importlib, sys
+# vaulture/vaulture/tests/test_paths.py
+import importlib, os, sys
 from pathlib import Path
 from types import ModuleType
+from typing import Callable, Iterator
+import pytest
 from pytest import MonkeyPatch
 
 PKG = "src.utils.paths"  # Single source-of-truth for re-imports
 
+# No caplog in here – safe to run with `pytest -p no:logging` (see test_migrate).
+
+# Expected source-mode locations, resolved once for the whole module.
+# realpath() mirrors paths.py, which resolves symlinks in its own __file__.
+_PROJECT_ROOT = Path(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))  # vaulture/vaulture
+_EXPECTED_DB = _PROJECT_ROOT / "src/infrastructure/database/data/vault.db"
+_EXPECTED_MIG = _PROJECT_ROOT / "src/infrastructure/database/migrations"
+
 
 def _reload_paths(_: MonkeyPatch | None = None) -> ModuleType:
-    """Drop src.utils.paths from sys.modules and import it fresh."""
-    sys.modules.pop(PKG, None)
-    return importlib.import_module(PKG)
+    """
+    Re-execute src.utils.paths so its import-time snapshot of
+    `sys.frozen` (and the caches) reflect the current monkeypatches.
+
+    Only the first call imports.  Afterwards the module's own loader
+    re-executes it in place – unlike `importlib.reload`, this skips the
+    `sys.meta_path` finder walk, and unlike building a new module it keeps
+    `src.utils.paths` and `sys.modules[PKG]` pointing at the same object.
+    """
+    mod = sys.modules.get(PKG)
+    if mod is None:
+        return importlib.import_module(PKG)
+    mod.__spec__.loader.exec_module(mod)  # type: ignore[union-attr]
+    return mod
+
+
+def _restore_dev_mode(monkeypatch: MonkeyPatch) -> ModuleType:
+    """
+    Put src.utils.paths back in dev mode after a test faked a frozen build.
+
+    Restoring `sys.frozen` alone is not enough any more: `_IS_FROZEN`,
+    `_FROZEN_DATA_DIR` and the cached helpers are import-time state of the
+    re-executed module.  So undo the monkeypatches first (which also stops
+    monkeypatch from later restoring function objects from an earlier
+    exec) and then re-execute the module once more against the real `sys`.
+    """
+    monkeypatch.undo()
+    return _reload_paths()
 
 
-def test_db_path_source(monkeypatch: MonkeyPatch) -> None:
+@pytest.fixture
+def reload_paths(monkeypatch: MonkeyPatch) -> Iterator[Callable[[], ModuleType]]:
+    """
+    Hand the test `_reload_paths` and put the module back in dev mode
+    afterwards (see `_restore_dev_mode`).
+    """
+    yield lambda: _reload_paths(monkeypatch)
+    _restore_dev_mode(monkeypatch)
+
+
+def test_db_path_source(reload_paths: Callable[[], ModuleType]) -> None:
     """
     In development/source mode `db_path()` must resolve to
     …/src/infrastructure/database/data/vault.db relative to project root.
     """
-    mod = _reload_paths(monkeypatch)        # ① fresh import → not frozen
+    mod = reload_paths()                    # ① fresh import → not frozen
     db_path = mod.db_path()                 # ② call
 
-    # ③ build the expected path by walking up from this test file
-    project_root = Path(__file__).resolve().parents[1]   # vaulture/vaulture
-    expected = (
-        project_root
-        / "src"
-        / "infrastructure"
-        / "database"
-        / "data"
-        / "vault.db"
-    )
-
-    # ④ assertions
-    assert db_path == expected
+    # ③ assertions against the path built from this test file's location
+    assert db_path == _EXPECTED_DB
     assert db_path.parent.exists(), "data/ directory is missing"
 
 
-def test_db_path_frozen(monkeypatch: MonkeyPatch, tmp_path: Path) -> None:
+def test_db_path_frozen(monkeypatch: MonkeyPatch, tmp_path: Path,
+                        reload_paths: Callable[[], ModuleType]) -> None:
     """When frozen, db_path() should go into user_data_dir(), mocked here."""
     # 1️⃣ Simulate "frozen" mode + dummy executable path
     monkeypatch.setattr(sys, "frozen", True, raising=False)
@@ -50,7 +85,7 @@ def test_db_path_frozen(monkeypatch: MonkeyPatch, tmp_path: Path) -> None:
         raising=True,
     )
 
-    mod = _reload_paths(monkeypatch)
+    mod = reload_paths()
     db_path = mod.db_path()
 
     expected = tmp_path / "my-data" / "vault.db"
@@ -58,29 +93,20 @@ def test_db_path_frozen(monkeypatch: MonkeyPatch, tmp_path: Path) -> None:
     assert db_path.parent.exists()
 
 
-def test_migrations_path_source(monkeypatch: MonkeyPatch) -> None:
+def test_migrations_path_source(reload_paths: Callable[[], ModuleType]) -> None:
     """
     migrations_path() should resolve to the repo-relative directory
     <inner-project-root>/src/infrastructure/database/migrations.
     """
-    mod = _reload_paths(monkeypatch)            # fresh import → not frozen
+    mod = reload_paths()                        # fresh import → not frozen
     mig_path = mod.migrations_path()
 
-    # walk up to <vaulture/vaulture>
-    project_root = Path(__file__).resolve().parents[1]
-    expected = (
-        project_root
-        / "src"
-        / "infrastructure"
-        / "database"
-        / "migrations"
-    )
-
-    assert mig_path == expected
+    assert mig_path == _EXPECTED_MIG
     assert mig_path.is_dir()
 
 
-def test_migrations_path_frozen(monkeypatch: MonkeyPatch, tmp_path: Path) -> None:
+def test_migrations_path_frozen(monkeypatch: MonkeyPatch, tmp_path: Path,
+                                reload_paths: Callable[[], ModuleType]) -> None:
     """
     When frozen, migrations_path() should sit next to the executable.
     """
@@ -93,7 +119,7 @@ def test_migrations_path_frozen(monkeypatch: MonkeyPatch, tmp_path: Path) -> Non
     monkeypatch.setattr(sys, "frozen", True, raising=False)
     monkeypatch.setattr(sys, "executable", str(exe_file))
 
-    mod = _reload_paths(monkeypatch)
+    mod = reload_paths()
     mig_path = mod.migrations_path()
 
     expected = exe_dir / "src" / "infrastructure" / "database" / "migrations"
@@ -101,12 +127,12 @@ def test_migrations_path_frozen(monkeypatch: MonkeyPatch, tmp_path: Path) -> Non
     assert not mig_path.exists()  # ❗does NOT auto-create folder
 
 
-def test_log_path_source(monkeypatch: MonkeyPatch) -> None:
+def test_log_path_source(reload_paths: Callable[[], ModuleType]) -> None:
     """
     log_path() in dev mode should resolve to …/logs/vaulture.log
     *inside the real project tree* and create the logs/ dir.
     """
-    mod = _reload_paths(monkeypatch)
+    mod = reload_paths()
     log_path = mod.log_path()
 
     # Log file should be named correctly and inside a "logs" folder
@@ -115,7 +141,8 @@ def test_log_path_source(monkeypatch: MonkeyPatch) -> None:
     assert log_path.parent.exists()
 
 
-def test_log_path_frozen(monkeypatch: MonkeyPatch, tmp_path: Path) -> None:
+def test_log_path_frozen(monkeypatch: MonkeyPatch, tmp_path: Path,
+                         reload_paths: Callable[[], ModuleType]) -> None:
     """
     In frozen builds, log_path() should resolve to inside user_data_dir().
     """
@@ -132,9 +159,34 @@ def test_log_path_frozen(monkeypatch: MonkeyPatch, tmp_path: Path) -> None:
         raising=True,
     )
 
-    mod = _reload_paths(monkeypatch)  # fresh import
+    mod = reload_paths()  # fresh import
     log_path = mod.log_path()
 
     expected = tmp_path / "user-logs" / "vaulture.log"
     assert log_path == expected
-    assert log_path.parent.exists()
\ No newline at end of file
+    assert log_path.parent.exists()
+
+
+def test_restore_dev_mode_after_frozen(monkeypatch: MonkeyPatch, tmp_path: Path) -> None:
+    """
+    The fixture's teardown must undo a faked frozen build completely:
+    after it, the shared module is back in dev mode with fresh caches, so
+    later importers (e.g. the migration runner) see the real source paths.
+    """
+    monkeypatch.setattr(sys, "frozen", True, raising=False)
+    monkeypatch.setattr(sys, "executable", str(tmp_path / "Vaulture.exe"))
+    monkeypatch.setattr(
+        "platformdirs.user_data_dir",
+        lambda *a, **kw: str(tmp_path / "my-data"),  # type:ignore
+        raising=True,
+    )
+    mod = _reload_paths(monkeypatch)
+    assert mod._IS_FROZEN is True
+    assert mod.db_path() == tmp_path / "my-data" / "vault.db"  # cache now frozen
+
+    mod = _restore_dev_mode(monkeypatch)
+
+    assert mod is sys.modules[PKG]
+    assert mod._IS_FROZEN is False
+    assert mod.db_path() == _EXPECTED_DB
+    assert mod.migrations_path() == _EXPECTED_MIG